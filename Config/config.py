@@ -1,19 +1,20 @@
-import os
+from pathlib import Path
 
 class Config:
     """
     Clase de configuración para rutas y parámetros del ETL.
     """
     # Base paths
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    PROJECT_ROOT = Path(__file__).resolve().parents[1]
     
     # Input data paths
-    INPUT_PATH = os.path.join(PROJECT_ROOT, 'Extract', 'Files', 'steam_games.csv')
-    OUTPUT_CLEAN_PATH = os.path.join(PROJECT_ROOT, 'Extract', 'Files', 'steam_games_clean.csv')
+    INPUT_PATH = PROJECT_ROOT / 'Extract' / 'Files' / 'steam_games.csv'
+    OUTPUT_CLEAN_PATH = PROJECT_ROOT / 'Extract' / 'Files' / 'steam_games_clean.csv'
     
     # Database configuration
-    DATABASE_DIR = os.path.join(PROJECT_ROOT, 'Database')
-    SQLITE_DB_PATH = os.path.join(DATABASE_DIR, 'steam_games.db')
+    DATABASE_DIR = PROJECT_ROOT / 'Database'
+    SQLITE_DB_PATH = DATABASE_DIR / 'steam_games.db'
+    SQLITE_DB_PATH_STR = str(SQLITE_DB_PATH)  # For APIs that expect a plain string path
     
     # Table names
     GAMES_TABLE = 'games'
@@ -31,6 +32,7 @@ class Config:
     # ETL Configuration
     BATCH_SIZE = 1000
     MAX_RETRIES = 3
+    TRANSFORM_WORKERS = None  # Threads for Transformer.clean; None = based on CPU count
     
     # Logging configuration
     LOG_LEVEL = 'INFO'
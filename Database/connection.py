@@ -0,0 +1,77 @@
+"""
+SQLite Connection Helpers for ETL Project
+Shared connection tuning applied by the loaders and database creators.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+
+# WAL journal with relaxed fsync, in-memory temp storage and a larger page cache
+_SQL_TUNE_PRAGMAS = '''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=268435456;
+'''
+
+
+def tune_connection(connection: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Apply the performance PRAGMAs to a freshly opened connection.
+    
+    Must run before any transaction is opened, since executescript commits
+    pending work first.
+    
+    Args:
+        connection (sqlite3.Connection): Connection to tune
+        
+    Returns:
+        sqlite3.Connection: The same connection, for chaining
+    """
+    connection.executescript(_SQL_TUNE_PRAGMAS)
+    return connection
+
+
+_shared: Dict[str, List] = {}
+_shared_lock = threading.Lock()
+
+
+@contextmanager
+def shared_connection(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Open one tuned connection per database path for the duration of the block.
+    
+    Nested blocks for the same path reuse the connection, so the page cache
+    stays warm across the create, load and index phases of an ETL run. The
+    connection is closed when the outermost block exits.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+        
+    Yields:
+        sqlite3.Connection: The shared connection
+    """
+    key = os.path.abspath(db_path)
+    with _shared_lock:
+        entry = _shared.get(key)
+        if entry is None:
+            Path(key).parent.mkdir(parents=True, exist_ok=True)
+            connection = tune_connection(sqlite3.connect(key, check_same_thread=False))
+            entry = _shared[key] = [connection, 0]
+        entry[1] += 1
+    
+    try:
+        yield entry[0]
+    finally:
+        with _shared_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _shared[key]
+                entry[0].close()
@@ -5,8 +5,79 @@ Handles database initialization and table creation for ride booking data.
 
 import sqlite3
 import os
+import itertools
 import logging
-from typing import Optional
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from Database.connection import tune_connection
+
+
+logger = logging.getLogger(__name__)
+
+
+_SQL_CREATE_TABLES = '''
+    CREATE TABLE IF NOT EXISTS rides (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ride_id TEXT UNIQUE NOT NULL,
+        pickup_datetime TEXT NOT NULL,
+        pickup_locationid INTEGER,
+        dropoff_locationid INTEGER,
+        passenger_count INTEGER,
+        trip_distance REAL,
+        fare_amount REAL,
+        extra REAL,
+        mta_tax REAL,
+        tip_amount REAL,
+        tolls_amount REAL,
+        total_amount REAL,
+        payment_type INTEGER,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS locations (
+        location_id INTEGER PRIMARY KEY,
+        borough TEXT,
+        zone TEXT,
+        service_zone TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS payment_types (
+        payment_type_id INTEGER PRIMARY KEY,
+        payment_method TEXT NOT NULL,
+        description TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS etl_logs (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        process_name TEXT NOT NULL,
+        start_time DATETIME NOT NULL,
+        end_time DATETIME,
+        status TEXT CHECK(status IN ('STARTED', 'COMPLETED', 'FAILED')) NOT NULL,
+        records_processed INTEGER DEFAULT 0,
+        error_message TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+'''
+
+# Indexes are built after loading data, keyed by the kind accepted by create_indexes()
+_INDEXES = {
+    'pickup_datetime': 'CREATE INDEX IF NOT EXISTS idx_rides_pickup_datetime ON rides(pickup_datetime)',
+    'pickup_location': 'CREATE INDEX IF NOT EXISTS idx_rides_pickup_location ON rides(pickup_locationid)',
+    'dropoff_location': 'CREATE INDEX IF NOT EXISTS idx_rides_dropoff_location ON rides(dropoff_locationid)',
+    'payment_type': 'CREATE INDEX IF NOT EXISTS idx_rides_payment_type ON rides(payment_type)',
+    'etl_logs_created_at': 'CREATE INDEX IF NOT EXISTS idx_etl_logs_created_at ON etl_logs(created_at DESC)',
+}
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote an SQL identifier so it can be interpolated safely."""
+    return '"' + name.replace('"', '""') + '"'
 
 
 class DatabaseCreator:
@@ -23,15 +94,6 @@ class DatabaseCreator:
         """
         self.db_path = db_path
         self.connection: Optional[sqlite3.Connection] = None
-        self.setup_logging()
-    
-    def setup_logging(self):
-        """Setup logging configuration for the database operations."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger(__name__)
     
     def connect(self) -> bool:
         """
@@ -42,23 +104,30 @@ class DatabaseCreator:
         """
         try:
             # Create directory if it doesn't exist
-            db_dir = os.path.dirname(self.db_path)
-            if db_dir and not os.path.exists(db_dir):
-                os.makedirs(db_dir)
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
             
-            self.connection = sqlite3.connect(self.db_path)
-            self.logger.info(f"Successfully connected to database: {self.db_path}")
+            self.connection = tune_connection(sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                cached_statements=256,
+                check_same_thread=False
+            ))
+            logger.info(f"Successfully connected to database: {self.db_path}")
             return True
         
         except sqlite3.Error as e:
-            self.logger.error(f"Error connecting to database: {e}")
+            logger.error(f"Error connecting to database: {e}")
             return False
     
     def disconnect(self):
-        """Close the database connection."""
+        """Close the database connection, refreshing planner statistics first."""
         if self.connection:
+            try:
+                self.connection.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
             self.connection.close()
-            self.logger.info("Database connection closed")
+            logger.info("Database connection closed")
     
     def create_tables(self) -> bool:
         """
@@ -68,83 +137,158 @@ class DatabaseCreator:
             bool: True if tables created successfully, False otherwise
         """
         if not self.connection:
-            self.logger.error("No database connection available")
+            logger.error("No database connection available")
             return False
         
         try:
-            cursor = self.connection.cursor()
+            # Submit all DDL in a single script and transaction; indexes are
+            # created separately by create_indexes() once data has been loaded
+            self.connection.executescript("BEGIN;" + _SQL_CREATE_TABLES + "COMMIT;")
             
-            # Create rides table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS rides (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ride_id TEXT UNIQUE NOT NULL,
-                    pickup_datetime TEXT NOT NULL,
-                    pickup_locationid INTEGER,
-                    dropoff_locationid INTEGER,
-                    passenger_count INTEGER,
-                    trip_distance REAL,
-                    fare_amount REAL,
-                    extra REAL,
-                    mta_tax REAL,
-                    tip_amount REAL,
-                    tolls_amount REAL,
-                    total_amount REAL,
-                    payment_type INTEGER,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create locations table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS locations (
-                    location_id INTEGER PRIMARY KEY,
-                    borough TEXT,
-                    zone TEXT,
-                    service_zone TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            logger.info("All tables created successfully")
+            return True
             
-            # Create payment_types table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS payment_types (
-                    payment_type_id INTEGER PRIMARY KEY,
-                    payment_method TEXT NOT NULL,
-                    description TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            logger.error(f"Error creating tables: {e}")
+            return False
+    
+    def create_indexes(self, kinds: Iterable[str] = tuple(_INDEXES)) -> bool:
+        """
+        Create the query indexes on the rides and etl_logs tables.
+        
+        Intended to run after bulk loading, since maintaining indexes during
+        the insert is considerably slower than building them once at the end.
+        
+        Args:
+            kinds (Iterable[str]): Indexes to build, any of the _INDEXES keys (default: all)
             
-            # Create ETL logs table for tracking processing
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS etl_logs (
-                    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    process_name TEXT NOT NULL,
-                    start_time DATETIME NOT NULL,
-                    end_time DATETIME,
-                    status TEXT CHECK(status IN ('STARTED', 'COMPLETED', 'FAILED')) NOT NULL,
-                    records_processed INTEGER DEFAULT 0,
-                    error_message TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        Returns:
+            bool: True if indexes created successfully, False otherwise
+        """
+        if not self.connection:
+            logger.error("No database connection available")
+            return False
+        
+        try:
+            statements = [(kind, _INDEXES[kind]) for kind in kinds]
+        except KeyError as e:
+            logger.error(f"Unknown index kind: {e}")
+            return False
+        
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            for kind, sql in statements:
+                start = time.perf_counter()
+                cursor.execute(sql)
+                logger.info(f"Index {kind} created in {time.perf_counter() - start:.3f}s")
+            cursor.execute("COMMIT")
             
-            # Create indexes for better query performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rides_pickup_datetime ON rides(pickup_datetime)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rides_pickup_location ON rides(pickup_locationid)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rides_dropoff_location ON rides(dropoff_locationid)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rides_payment_type ON rides(payment_type)')
+            logger.info("All indexes created successfully")
+            return True
             
-            self.connection.commit()
-            self.logger.info("All tables created successfully")
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            logger.error(f"Error creating indexes: {e}")
+            return False
+    
+    def analyze(self) -> bool:
+        """
+        Gather planner statistics for all tables and indexes.
+        
+        Returns:
+            bool: True if ANALYZE ran successfully, False otherwise
+        """
+        if not self.connection:
+            logger.error("No database connection available")
+            return False
+        
+        try:
+            self.connection.execute("ANALYZE")
+            logger.info("Database statistics updated")
             return True
             
         except sqlite3.Error as e:
-            self.logger.error(f"Error creating tables: {e}")
+            logger.error(f"Error analyzing database: {e}")
             return False
     
+    @contextmanager
+    def bulk_load(self, kinds: Iterable[str] = tuple(_INDEXES)) -> Iterator[None]:
+        """
+        Context manager for the load phase of the ETL.
+        
+        Turns off fsync while the block runs, then builds the requested indexes,
+        analyzes them and restores synchronous=NORMAL. The WAL journal is kept,
+        since switching journal mode fails while other connections use the WAL.
+        If the block raises, its open transaction is rolled back before the
+        PRAGMA is restored, so no partial load is committed.
+        
+        Args:
+            kinds (Iterable[str]): Indexes to build once the load finishes
+        """
+        self.connection.execute("PRAGMA synchronous=OFF")
+        try:
+            yield
+            if self.create_indexes(kinds):
+                self.analyze()
+        except BaseException:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            raise
+        finally:
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+    
+    def bulk_insert(self, table: str, columns: List[str], rows: Iterable[Sequence], chunk: int = 10_000) -> int:
+        """
+        Insert rows into a table inside a single explicit transaction.
+        
+        The INSERT statement is prepared once and reused for every chunk, so
+        only one commit hits the disk regardless of the number of rows. When a
+        transaction is already open the rows join it and the caller commits.
+        
+        Args:
+            table (str): Target table name
+            columns (List[str]): Column names, in the order of each row's values
+            rows (Iterable[Sequence]): Rows to insert
+            chunk (int): Number of rows passed to each executemany call
+            
+        Returns:
+            int: Number of rows submitted for insertion
+            
+        Raises:
+            sqlite3.Error: If the insert fails; a transaction opened here is rolled back
+                on any exception, including ones raised while iterating rows
+        """
+        column_list = ', '.join(_quote_identifier(col) for col in columns)
+        placeholders = ', '.join('?' * len(columns))
+        sql = f'INSERT OR IGNORE INTO {_quote_identifier(table)} ({column_list}) VALUES ({placeholders})'
+        
+        cursor = self.connection.cursor()
+        submitted = 0
+        owns_transaction = not self.connection.in_transaction
+        if owns_transaction:
+            cursor.execute("BEGIN")
+        try:
+            it = iter(rows)
+            while True:
+                batch = list(itertools.islice(it, chunk))
+                if not batch:
+                    break
+                cursor.executemany(sql, batch)
+                submitted += len(batch)
+            if owns_transaction:
+                cursor.execute("COMMIT")
+        except BaseException:
+            # Also covers errors raised by the rows iterable itself
+            if owns_transaction:
+                self.connection.rollback()
+            raise
+        
+        return submitted
+    
     def insert_default_data(self) -> bool:
         """
         Insert default/reference data into lookup tables.
@@ -153,12 +297,10 @@ class DatabaseCreator:
             bool: True if data inserted successfully, False otherwise
         """
         if not self.connection:
-            self.logger.error("No database connection available")
+            logger.error("No database connection available")
             return False
         
         try:
-            cursor = self.connection.cursor()
-            
             # Insert default payment types
             payment_types = [
                 (1, 'Credit Card', 'Standard credit card payment'),
@@ -169,17 +311,17 @@ class DatabaseCreator:
                 (6, 'Voided Trip', 'Voided trip')
             ]
             
-            cursor.executemany('''
-                INSERT OR IGNORE INTO payment_types (payment_type_id, payment_method, description)
-                VALUES (?, ?, ?)
-            ''', payment_types)
+            self.bulk_insert(
+                'payment_types',
+                ['payment_type_id', 'payment_method', 'description'],
+                payment_types
+            )
             
-            self.connection.commit()
-            self.logger.info("Default data inserted successfully")
+            logger.info("Default data inserted successfully")
             return True
             
         except sqlite3.Error as e:
-            self.logger.error(f"Error inserting default data: {e}")
+            logger.error(f"Error inserting default data: {e}")
             return False
     
     def drop_all_tables(self) -> bool:
@@ -190,28 +332,85 @@ class DatabaseCreator:
             bool: True if tables dropped successfully, False otherwise
         """
         if not self.connection:
-            self.logger.error("No database connection available")
+            logger.error("No database connection available")
             return False
         
         try:
-            cursor = self.connection.cursor()
+            # Drop every table in a single script and transaction
+            self.connection.executescript(
+                "PRAGMA foreign_keys=OFF;BEGIN;" + self._drop_tables_sql() + "COMMIT;PRAGMA foreign_keys=ON;"
+            )
+            
+            logger.info("All tables dropped successfully")
+            return True
+            
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            logger.error(f"Error dropping tables: {e}")
+            return False
+    
+    def _drop_tables_sql(self) -> str:
+        """
+        Build the DROP TABLE statements for every user table.
+        
+        Returns:
+            str: Script dropping all tables except the SQLite system table
+        """
+        names = [name for (name,) in self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence'"
+        )]
+        return "".join(f'DROP TABLE IF EXISTS {_quote_identifier(name)};' for name in names)
+    
+    def _apply_schema(self, preamble: str) -> bool:
+        """
+        Create and seed all tables in a single transaction on the open connection.
+        
+        Args:
+            preamble (str): Script that opens the transaction, optionally followed
+                by statements to run in it before the DDL (e.g. DROP TABLEs)
             
-            # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
+        Returns:
+            bool: True if committed, False if the transaction was rolled back
+        """
+        try:
+            # The script leaves the transaction open for the seed data below
+            self.connection.executescript(preamble + _SQL_CREATE_TABLES)
+            if not self.insert_default_data():
+                self.connection.rollback()
+                return False
+            self.connection.execute("COMMIT")
+            return True
             
-            # Drop each table
-            for table in tables:
-                table_name = table[0]
-                if table_name != 'sqlite_sequence':  # Skip SQLite system table
-                    cursor.execute(f'DROP TABLE IF EXISTS {table_name}')
+        except sqlite3.Error:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            raise
+    
+    def reset(self) -> bool:
+        """
+        Drop, recreate and seed all tables over the open connection.
+        
+        Everything runs inside one BEGIN IMMEDIATE ... COMMIT, so the reset
+        either fully applies or leaves the database untouched.
+        
+        Returns:
+            bool: True if the reset succeeded, False otherwise
+        """
+        if not self.connection:
+            logger.error("No database connection available")
+            return False
+        
+        try:
+            if not self._apply_schema("PRAGMA foreign_keys=OFF;BEGIN IMMEDIATE;" + self._drop_tables_sql()):
+                return False
+            self.connection.execute("PRAGMA foreign_keys=ON")
             
-            self.connection.commit()
-            self.logger.info("All tables dropped successfully")
+            logger.info("Database reset successfully")
             return True
             
         except sqlite3.Error as e:
-            self.logger.error(f"Error dropping tables: {e}")
+            logger.error(f"Error resetting database: {e}")
             return False
     
     def get_table_info(self, table_name: str) -> list:
@@ -225,7 +424,7 @@ class DatabaseCreator:
             list: Table schema information
         """
         if not self.connection:
-            self.logger.error("No database connection available")
+            logger.error("No database connection available")
             return []
         
         try:
@@ -234,31 +433,35 @@ class DatabaseCreator:
             return cursor.fetchall()
         
         except sqlite3.Error as e:
-            self.logger.error(f"Error getting table info for {table_name}: {e}")
+            logger.error(f"Error getting table info for {table_name}: {e}")
             return []
     
     def initialize_database(self) -> bool:
         """
         Complete database initialization process.
         
+        Indexes are not created here; call create_indexes() after the ETL load.
+        
         Returns:
             bool: True if initialization successful, False otherwise
         """
-        self.logger.info("Starting database initialization...")
+        logger.info("Starting database initialization...")
         
         if not self.connect():
             return False
         
-        if not self.create_tables():
-            self.disconnect()
+        # Tables and default data share one transaction: a failure rolls back
+        # everything and only one commit reaches the disk
+        try:
+            if not self._apply_schema("BEGIN;"):
+                return False
+        except sqlite3.Error:
+            logger.exception("Database initialization failed")
             return False
-        
-        if not self.insert_default_data():
+        finally:
             self.disconnect()
-            return False
         
-        self.disconnect()
-        self.logger.info("Database initialization completed successfully")
+        logger.info("Database initialization completed successfully")
         return True
 
 
@@ -284,6 +487,11 @@ def create_database(db_path: str, reset: bool = False) -> bool:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # Example usage
     db_path = os.path.join(os.path.dirname(__file__), "ride_bookings.db")
     
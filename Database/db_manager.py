@@ -4,40 +4,152 @@ Provides utility functions for database inspection and management.
 """
 
 import sqlite3
+import asyncio
+import csv
+import gzip
 import logging
-from typing import List, Dict, Any, Optional
+import queue
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator, List, Dict, Any, Optional
 from Database.db_creator import DatabaseCreator
 from Config.config import Config
 
+try:
+    import pandas as _pd
+except ImportError:
+    _pd = None
+
+
+EXPORT_BATCH_SIZE = 10_000
+
+_SQL_SELECT_LOGS = '''
+    SELECT log_id, process_name, start_time, end_time, status, 
+           records_processed, error_message, created_at
+    FROM etl_logs 
+    ORDER BY created_at DESC 
+    LIMIT ?
+'''
+
 
 class DatabaseManager:
     """
     Utility class for managing and inspecting the ETL database.
+    
+    Read connections are opened lazily and kept in a small pool that is reused
+    across method calls. Use the manager as a context manager (or call close())
+    to release them.
     """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, pool_size: int = 4):
         """
         Initialize DatabaseManager with database path.
         
         Args:
             db_path (str): Path to the SQLite database file
+            pool_size (int): Maximum number of pooled read connections
         """
-        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.db_path = db_path or Config.SQLITE_DB_PATH_STR
         self.logger = logging.getLogger(__name__)
+        self._pool_size = pool_size
+        self._pool: queue.Queue = queue.Queue(maxsize=pool_size)
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # One SQL string per table keeps SQLite's statement cache hot
+        self._count_stmts: Dict[str, str] = {}
+        self._dbstat: Optional[bool] = None
+        self._tables: Optional[set] = None
     
-    def get_connection(self) -> Optional[sqlite3.Connection]:
+    def __enter__(self) -> "DatabaseManager":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _open_connection(self) -> Optional[sqlite3.Connection]:
         """
-        Get a connection to the database.
+        Open a new read-only connection to the database.
         
         Returns:
             Optional[sqlite3.Connection]: Database connection or None if failed
         """
         try:
-            return sqlite3.connect(self.db_path)
+            connection = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None, cached_statements=256
+            )
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA query_only=1")
+            return connection
         except sqlite3.Error as e:
             self.logger.error(f"Error connecting to database: {e}")
             return None
     
+    @contextmanager
+    def _borrow(self) -> Iterator[Optional[sqlite3.Connection]]:
+        """
+        Borrow a pooled connection, opening a new one while the pool is not full.
+        
+        Yields:
+            Optional[sqlite3.Connection]: Database connection or None if failed
+        """
+        connection = None
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = len(self._connections) < self._pool_size
+                if can_open:
+                    connection = self._open_connection()
+                    if connection is not None:
+                        self._connections.append(connection)
+            if not can_open:
+                # Pool exhausted: wait for another caller to return a connection
+                connection = self._pool.get()
+        
+        if connection is None:
+            yield None
+            return
+        
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+    
+    def _check_table(self, table_name: str):
+        """
+        Validate a table name against the tables listed in sqlite_master.
+        
+        The known names are cached and refreshed once on a miss, so tables
+        created after the first lookup are still accepted.
+        
+        Raises:
+            ValueError: If the table does not exist in the database
+        """
+        if self._tables is None or table_name not in self._tables:
+            self._tables = set(self.get_table_list())
+            if table_name not in self._tables:
+                raise ValueError(f"Unknown table: {table_name}")
+    
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        """Quote an SQL identifier so it can be interpolated safely."""
+        return '"' + identifier.replace('"', '""') + '"'
+    
+    def close(self):
+        """Close every pooled connection, refreshing planner statistics first."""
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    # optimize may need to write sqlite_stat1
+                    connection.execute("PRAGMA query_only=0")
+                    connection.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    self.logger.warning(f"PRAGMA optimize failed: {e}")
+                connection.close()
+            self._connections.clear()
+            self._pool = queue.Queue(maxsize=self._pool_size)
+    
     def get_table_list(self) -> List[str]:
         """
         Get a list of all tables in the database.
@@ -45,20 +157,17 @@ class DatabaseManager:
         Returns:
             List[str]: List of table names
         """
-        connection = self.get_connection()
-        if not connection:
-            return []
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [row[0] for row in cursor.fetchall()]
-            connection.close()
-            return tables
-        except sqlite3.Error as e:
-            self.logger.error(f"Error getting table list: {e}")
-            connection.close()
-            return []
+        with self._borrow() as connection:
+            if not connection:
+                return []
+            
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+                return [row[0] for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                self.logger.error(f"Error getting table list: {e}")
+                return []
     
     def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
         """
@@ -69,59 +178,116 @@ class DatabaseManager:
             
         Returns:
             List[Dict[str, Any]]: List of column information dictionaries
+            
+        Raises:
+            ValueError: If the table does not exist in the database
         """
-        connection = self.get_connection()
-        if not connection:
-            return []
+        self._check_table(table_name)
         
-        try:
-            cursor = connection.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-            connection.close()
-            
-            # Convert to more readable format
-            schema = []
-            for col in columns:
-                schema.append({
-                    'column_id': col[0],
-                    'name': col[1],
-                    'type': col[2],
-                    'not_null': bool(col[3]),
-                    'default_value': col[4],
-                    'primary_key': bool(col[5])
-                })
+        with self._borrow() as connection:
+            if not connection:
+                return []
             
-            return schema
-        except sqlite3.Error as e:
-            self.logger.error(f"Error getting table schema for {table_name}: {e}")
-            connection.close()
-            return []
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT * FROM pragma_table_info(?)", (table_name,))
+                columns = cursor.fetchall()
+            except sqlite3.Error as e:
+                self.logger.error(f"Error getting table schema for {table_name}: {e}")
+                return []
+        
+        # Convert to more readable format
+        return [{
+            'column_id': col['cid'],
+            'name': col['name'],
+            'type': col['type'],
+            'not_null': bool(col['notnull']),
+            'default_value': col['dflt_value'],
+            'primary_key': bool(col['pk'])
+        } for col in columns]
     
-    def get_table_count(self, table_name: str) -> int:
+    def get_table_count(self, table_name: str, exact: bool = True) -> int:
         """
         Get the number of records in a table.
         
         Args:
             table_name (str): Name of the table
+            exact (bool): If False, return an estimate from sqlite_stat1 (populated
+                by ANALYZE) or the dbstat virtual table instead of a COUNT(*) scan
             
         Returns:
             int: Number of records, -1 if error
+            
+        Raises:
+            ValueError: If the table does not exist in the database
         """
-        connection = self.get_connection()
-        if not connection:
-            return -1
+        self._check_table(table_name)
+        
+        with self._borrow() as connection:
+            if not connection:
+                return -1
+            
+            try:
+                cursor = connection.cursor()
+                if not exact:
+                    estimate = self._estimate_counts(cursor, [table_name]).get(table_name)
+                    if estimate is not None:
+                        return estimate
+                
+                sql = self._count_stmts.get(table_name)
+                if sql is None:
+                    sql = self._count_stmts[table_name] = f"SELECT COUNT(*) FROM {self._quote(table_name)}"
+                cursor.execute(sql)
+                return cursor.fetchone()[0]
+            except sqlite3.Error as e:
+                self.logger.error(f"Error getting count for table {table_name}: {e}")
+                return -1
+    
+    def _estimate_counts(self, cursor: sqlite3.Cursor, tables: List[str]) -> Dict[str, int]:
+        """
+        Estimate row counts without scanning the tables.
+        
+        Uses the row estimate stored in sqlite_stat1 and, for tables it does not
+        cover, the number of cells on each table's leaf pages from dbstat.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor on a pooled connection
+            tables (List[str]): Tables to estimate
+            
+        Returns:
+            Dict[str, int]: Estimated counts for the tables that could be estimated
+        """
+        estimates: Dict[str, int] = {}
+        wanted = set(tables)
         
         try:
-            cursor = connection.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            connection.close()
-            return count
-        except sqlite3.Error as e:
-            self.logger.error(f"Error getting count for table {table_name}: {e}")
-            connection.close()
-            return -1
+            cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+            for table, stat in cursor.fetchall():
+                if table in wanted and stat:
+                    estimates.setdefault(table, int(stat.split()[0]))
+        except sqlite3.OperationalError:
+            # sqlite_stat1 only exists once ANALYZE has run
+            pass
+        
+        missing = [table for table in tables if table not in estimates]
+        if missing and self._has_dbstat(cursor):
+            placeholders = ', '.join('?' * len(missing))
+            cursor.execute(
+                f"SELECT name, SUM(ncell) FROM dbstat "
+                f"WHERE pagetype = 'leaf' AND name IN ({placeholders}) GROUP BY name",
+                missing
+            )
+            for table, cells in cursor.fetchall():
+                estimates[table] = cells or 0
+        
+        return estimates
+    
+    def _has_dbstat(self, cursor: sqlite3.Cursor) -> bool:
+        """Check once whether SQLite was compiled with the dbstat virtual table."""
+        if self._dbstat is None:
+            cursor.execute("PRAGMA compile_options")
+            self._dbstat = any(row[0] == 'ENABLE_DBSTAT_VTAB' for row in cursor.fetchall())
+        return self._dbstat
     
     def get_etl_logs(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -133,44 +299,27 @@ class DatabaseManager:
         Returns:
             List[Dict[str, Any]]: List of ETL log dictionaries
         """
-        connection = self.get_connection()
-        if not connection:
-            return []
-        
-        try:
-            cursor = connection.cursor()
-            cursor.execute('''
-                SELECT log_id, process_name, start_time, end_time, status, 
-                       records_processed, error_message, created_at
-                FROM etl_logs 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            ''', (limit,))
+        with self._borrow() as connection:
+            if not connection:
+                return []
             
-            logs = []
-            for row in cursor.fetchall():
-                logs.append({
-                    'log_id': row[0],
-                    'process_name': row[1],
-                    'start_time': row[2],
-                    'end_time': row[3],
-                    'status': row[4],
-                    'records_processed': row[5],
-                    'error_message': row[6],
-                    'created_at': row[7]
-                })
-            
-            connection.close()
-            return logs
-        except sqlite3.Error as e:
-            self.logger.error(f"Error getting ETL logs: {e}")
-            connection.close()
-            return []
+            try:
+                cursor = connection.cursor()
+                cursor.execute(_SQL_SELECT_LOGS, (limit,))
+                return [dict(row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                self.logger.error(f"Error getting ETL logs: {e}")
+                return []
     
-    def get_database_summary(self) -> Dict[str, Any]:
+    def get_database_summary(self, exact: bool = False) -> Dict[str, Any]:
         """
         Get a comprehensive summary of the database.
         
+        Args:
+            exact (bool): Count every table with COUNT(*) instead of using the
+                estimates from get_table_count(exact=False); the summary is
+                informational, so estimates are the default
+            
         Returns:
             Dict[str, Any]: Database summary information
         """
@@ -181,12 +330,84 @@ class DatabaseManager:
             'recent_etl_logs': []
         }
         
-        # Get all tables and their information
-        tables = self.get_table_list()
-        for table in tables:
-            count = self.get_table_count(table)
-            schema = self.get_table_schema(table)
+        with self._borrow() as connection:
+            if not connection:
+                return summary
+            
+            try:
+                cursor = connection.cursor()
+                
+                # Gather every table's columns in a single query
+                cursor.execute('''
+                    SELECT m.name AS table_name, p.name AS column_name
+                    FROM sqlite_master m
+                    JOIN pragma_table_info(m.name) p
+                    WHERE m.type = 'table'
+                    ORDER BY m.rowid, p.cid
+                ''')
+                columns: Dict[str, List[str]] = {}
+                for table, column in cursor.fetchall():
+                    columns.setdefault(table, []).append(column)
+                
+                counts = {} if exact else self._estimate_counts(cursor, list(columns))
+                
+                # Count the remaining tables in one round-trip
+                missing = [table for table in columns if table not in counts]
+                if missing:
+                    cursor.execute(" UNION ALL ".join(
+                        f"SELECT ? AS name, COUNT(*) AS c FROM {self._quote(table)}"
+                        for table in missing
+                    ), missing)
+                    counts.update(cursor.fetchall())
+            except sqlite3.Error as e:
+                self.logger.error(f"Error getting database summary: {e}")
+                return summary
+        
+        for table, table_columns in columns.items():
+            summary['tables'][table] = {
+                'record_count': counts.get(table, -1),
+                'column_count': len(table_columns),
+                'columns': table_columns
+            }
+        
+        summary['total_records'] = sum(counts.values())
+        
+        # Get recent ETL logs
+        summary['recent_etl_logs'] = self.get_etl_logs(5)
+        
+        return summary
+    
+    async def get_database_summary_async(self, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get the database summary, counting and inspecting tables concurrently.
+        
+        Each per-table lookup runs in a worker thread on its own pooled
+        connection, so latency scales with tables / pool_size. This only pays
+        off for databases with dozens of large tables; otherwise the few
+        queries issued by get_database_summary are cheaper.
+        
+        Args:
+            exact (bool): Count every table with COUNT(*) instead of estimating
             
+        Returns:
+            Dict[str, Any]: Database summary information, as get_database_summary
+        """
+        summary = {
+            'database_path': self.db_path,
+            'tables': {},
+            'total_records': 0,
+            'recent_etl_logs': []
+        }
+        
+        tables = await asyncio.to_thread(self.get_table_list)
+        counts = await asyncio.gather(*(
+            asyncio.to_thread(self.get_table_count, table, exact) for table in tables
+        ))
+        schemas = await asyncio.gather(*(
+            asyncio.to_thread(self.get_table_schema, table) for table in tables
+        ))
+        
+        for table, count, schema in zip(tables, counts, schemas):
             summary['tables'][table] = {
                 'record_count': count,
                 'column_count': len(schema),
@@ -197,80 +418,154 @@ class DatabaseManager:
                 summary['total_records'] += count
         
         # Get recent ETL logs
-        summary['recent_etl_logs'] = self.get_etl_logs(5)
+        summary['recent_etl_logs'] = await asyncio.to_thread(self.get_etl_logs, 5)
         
         return summary
     
-    def export_table_to_csv(self, table_name: str, output_path: str) -> bool:
+    def export_table_to_csv(self, table_name: str, output_path: str, use_pandas: bool = True) -> bool:
         """
         Export a table to CSV format.
         
+        Rows are streamed in batches, so memory use does not grow with the
+        table size. Paths ending in '.gz' are written gzip-compressed.
+        
         Args:
             table_name (str): Name of the table to export
             output_path (str): Path where to save the CSV file
+            use_pandas (bool): Use pandas when it is installed; pass False to
+                skip its overhead for small tables
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            ValueError: If the table does not exist in the database
         """
-        connection = self.get_connection()
-        if not connection:
-            return False
+        self._check_table(table_name)
+        select_sql = f"SELECT * FROM {self._quote(table_name)}"
+        compress = output_path.endswith('.gz')
         
-        try:
-            # Use pandas if available, otherwise manual export
+        with self._borrow() as connection:
+            if not connection:
+                return False
+            
             try:
-                import pandas as pd
-                df = pd.read_sql_query(f"SELECT * FROM {table_name}", connection)
-                df.to_csv(output_path, index=False)
-            except ImportError:
-                # Manual CSV export if pandas not available
-                import csv
-                cursor = connection.cursor()
-                cursor.execute(f"SELECT * FROM {table_name}")
-                
-                with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    # Get column names
-                    cursor.execute(f"PRAGMA table_info({table_name})")
-                    columns = [col[1] for col in cursor.fetchall()]
-                    
-                    writer = csv.writer(csvfile)
-                    writer.writerow(columns)
+                # Use pandas if available, otherwise manual export
+                if use_pandas and _pd is not None:
+                    with self._open_output(output_path) as csvfile:
+                        first = True
+                        for chunk in _pd.read_sql_query(select_sql, connection, chunksize=EXPORT_BATCH_SIZE):
+                            chunk.to_csv(csvfile, header=first, index=False)
+                            first = False
+                # Prefer the sqlite3 CLI for plain CSV, otherwise stream rows manually
+                elif compress or not self._try_cli_export(table_name, output_path):
+                    cursor = connection.cursor()
+                    cursor.arraysize = EXPORT_BATCH_SIZE
+                    cursor.execute(select_sql)
                     
-                    # Write data
-                    cursor.execute(f"SELECT * FROM {table_name}")
-                    for row in cursor.fetchall():
-                        writer.writerow(row)
+                    with self._open_output(output_path) as csvfile:
+                        writer = csv.writer(csvfile)
+                        writer.writerow([col[0] for col in cursor.description])
+                        
+                        # Write data in bounded batches
+                        while True:
+                            rows = cursor.fetchmany()
+                            if not rows:
+                                break
+                            writer.writerows(rows)
+                
+                self.logger.info(f"Table {table_name} exported to {output_path}")
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Error exporting table {table_name}: {e}")
+                return False
+    
+    @staticmethod
+    def _open_output(output_path: str) -> IO[str]:
+        """Open a text file for CSV writing, gzip-compressed if the path ends in '.gz'."""
+        if output_path.endswith('.gz'):
+            return gzip.open(output_path, 'wt', newline='', encoding='utf-8')
+        return open(output_path, 'w', newline='', encoding='utf-8')
+    
+    def export_database_sql(self, output_path: str) -> bool:
+        """
+        Stream an SQL dump of the whole database into a gzip-compressed file.
+        
+        Args:
+            output_path (str): Path where to save the compressed dump
             
-            connection.close()
-            self.logger.info(f"Table {table_name} exported to {output_path}")
-            return True
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._borrow() as connection:
+            if not connection:
+                return False
             
-        except Exception as e:
-            self.logger.error(f"Error exporting table {table_name}: {e}")
-            connection.close()
+            try:
+                with gzip.open(output_path, 'wt', encoding='utf-8') as dumpfile:
+                    for line in connection.iterdump():
+                        dumpfile.write(line + '\n')
+                
+                self.logger.info(f"Database dumped to {output_path}")
+                return True
+                
+            except Exception as e:
+                self.logger.error(f"Error dumping database: {e}")
+                return False
+    
+    def _try_cli_export(self, table_name: str, output_path: str) -> bool:
+        """
+        Export a table to CSV through the sqlite3 command line tool.
+        
+        Args:
+            table_name (str): Name of the table to export
+            output_path (str): Path where to save the CSV file
+            
+        Returns:
+            bool: True if the CLI produced the file, False if it is unavailable or failed
+        """
+        script = (
+            ".headers on\n"
+            ".mode csv\n"
+            f"SELECT * FROM {self._quote(table_name)};\n"
+        )
+        try:
+            # The CLI writes to stdout, so the output path never appears in the script
+            with open(output_path, 'wb') as csvfile:
+                subprocess.run(
+                    ['sqlite3', '-readonly', self.db_path],
+                    input=script.encode('utf-8'), stdout=csvfile, stderr=subprocess.PIPE, check=True
+                )
+            return True
+        except FileNotFoundError:
+            return False
+        except subprocess.CalledProcessError as e:
+            self.logger.warning(
+                f"sqlite3 CLI export failed, falling back to Python: {e.stderr.decode(errors='replace').strip()}"
+            )
             return False
     
     def reset_database(self) -> bool:
         """
         Reset the database by dropping and recreating all tables.
         
+        The drop, create and seed steps share a single connection and transaction.
+        
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             db_creator = DatabaseCreator(self.db_path)
-            
-            # Connect and drop tables
-            if db_creator.connect():
-                if db_creator.drop_all_tables():
-                    db_creator.disconnect()
-                    # Reinitialize the database
-                    return db_creator.initialize_database()
-                else:
-                    db_creator.disconnect()
-                    return False
-            else:
+            if not db_creator.connect():
                 return False
+            
+            try:
+                return db_creator.reset()
+            finally:
+                db_creator.disconnect()
+                # Table names are re-read on the next lookup
+                self._tables = None
                 
         except Exception as e:
             self.logger.error(f"Error resetting database: {e}")
@@ -284,8 +579,8 @@ def print_database_summary(db_path: str = None):
     Args:
         db_path (str): Path to the database file
     """
-    db_manager = DatabaseManager(db_path)
-    summary = db_manager.get_database_summary()
+    with DatabaseManager(db_path) as db_manager:
+        summary = db_manager.get_database_summary(exact=True)
     
     print("=" * 50)
     print("DATABASE SUMMARY")
@@ -7,6 +7,142 @@ import sqlite3
 import os
 import logging
 from typing import Optional
+from Database.connection import tune_connection
+
+
+# Stored in PRAGMA user_version once the tables exist; bump it whenever the DDL below changes
+_SCHEMA_VERSION = 1
+
+# Tables and triggers created by _SQL_CREATE_TABLES; the DDL is only skipped when all of them exist
+_STEAM_TABLES = ('games', 'developers', 'publishers', 'genres', 'etl_logs', 'stats')
+_STEAM_TRIGGERS = ('trg_games_count_insert', 'trg_games_count_delete')
+
+_SQL_CREATE_TABLES = f'''
+    BEGIN;
+
+    CREATE TABLE IF NOT EXISTS games (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        game_type TEXT,
+        name TEXT NOT NULL,
+        desc_snippet TEXT,
+        recent_reviews TEXT,
+        all_reviews TEXT,
+        release_date TEXT,
+        developer TEXT,
+        publisher TEXT,
+        popular_tags TEXT,
+        game_details TEXT,
+        languages TEXT,
+        achievements INTEGER,
+        genre TEXT,
+        game_description TEXT,
+        mature_content TEXT,
+        minimum_requirements TEXT,
+        recommended_requirements TEXT,
+        original_price REAL,
+        discount_price REAL,
+        final_price REAL,
+        discount_percentage REAL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS developers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        games_count INTEGER DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS publishers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        games_count INTEGER DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS genres (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        games_count INTEGER DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS etl_logs (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        process_name TEXT NOT NULL,
+        start_time DATETIME NOT NULL,
+        end_time DATETIME,
+        status TEXT CHECK(status IN ('STARTED', 'COMPLETED', 'FAILED')) NOT NULL,
+        records_processed INTEGER DEFAULT 0,
+        error_message TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Materialized counters kept current by triggers, so reads are O(1)
+    CREATE TABLE IF NOT EXISTS stats (
+        key TEXT PRIMARY KEY,
+        val INTEGER NOT NULL DEFAULT 0
+    );
+
+    -- Recount whenever the DDL runs, since the triggers may have been dropped with games
+    INSERT OR REPLACE INTO stats (key, val) SELECT 'games_count', COUNT(*) FROM games;
+
+    CREATE TRIGGER IF NOT EXISTS trg_games_count_insert AFTER INSERT ON games
+    BEGIN
+        UPDATE stats SET val = val + 1 WHERE key = 'games_count';
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_games_count_delete AFTER DELETE ON games
+    BEGIN
+        UPDATE stats SET val = val - 1 WHERE key = 'games_count';
+    END;
+
+    PRAGMA user_version = {_SCHEMA_VERSION};
+
+    COMMIT;
+'''
+
+# Built after the bulk load so inserts do not pay for index maintenance
+_SQL_CREATE_INDEXES = '''
+    BEGIN;
+
+    CREATE INDEX IF NOT EXISTS idx_games_name ON games(name);
+    CREATE INDEX IF NOT EXISTS idx_games_developer ON games(developer);
+    CREATE INDEX IF NOT EXISTS idx_games_publisher ON games(publisher);
+    CREATE INDEX IF NOT EXISTS idx_games_genre ON games(genre);
+    CREATE INDEX IF NOT EXISTS idx_games_release_date ON games(release_date);
+    CREATE INDEX IF NOT EXISTS idx_games_price ON games(original_price);
+    CREATE INDEX IF NOT EXISTS idx_etl_logs_created_at ON etl_logs(created_at DESC);
+
+    COMMIT;
+'''
+
+# Lookup table aggregates, computed by SQLite over the loaded games table
+_SQL_POPULATE_LOOKUP_TABLES = '''
+    BEGIN;
+
+    INSERT INTO developers (name, games_count)
+    SELECT developer, COUNT(*) FROM games
+    WHERE developer IS NOT NULL AND developer != 'Unknown'
+    GROUP BY developer
+    ON CONFLICT(name) DO UPDATE SET games_count = excluded.games_count;
+
+    INSERT INTO publishers (name, games_count)
+    SELECT publisher, COUNT(*) FROM games
+    WHERE publisher IS NOT NULL AND publisher != 'Unknown'
+    GROUP BY publisher
+    ON CONFLICT(name) DO UPDATE SET games_count = excluded.games_count;
+
+    INSERT INTO genres (name, games_count)
+    SELECT genre, COUNT(*) FROM games
+    WHERE genre IS NOT NULL AND genre != 'Unknown'
+    GROUP BY genre
+    ON CONFLICT(name) DO UPDATE SET games_count = excluded.games_count;
+
+    COMMIT;
+'''
 
 
 class SteamGamesDBCreator:
@@ -14,23 +150,19 @@ class SteamGamesDBCreator:
     Handles the creation and initialization of the SQLite database for Steam games ETL project.
     """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, connection: Optional[sqlite3.Connection] = None):
         """
         Initialize SteamGamesDBCreator with database path.
         
         Args:
             db_path (str): Path to the SQLite database file
+            connection (sqlite3.Connection, optional): Shared connection to use
+                instead of opening a new one; it is left open on disconnect()
         """
         self.db_path = db_path
         self.connection: Optional[sqlite3.Connection] = None
-        self.setup_logging()
-    
-    def setup_logging(self):
-        """Setup logging configuration for the database operations."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        self._shared_connection = connection
+        # Logging is configured by the entry point (main.setup_logging), not per instance
         self.logger = logging.getLogger(__name__)
     
     def connect(self) -> bool:
@@ -40,13 +172,17 @@ class SteamGamesDBCreator:
         Returns:
             bool: True if connection successful, False otherwise
         """
+        if self._shared_connection is not None:
+            self.connection = self._shared_connection
+            return True
+        
         try:
             # Create directory if it doesn't exist
             db_dir = os.path.dirname(self.db_path)
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir)
             
-            self.connection = sqlite3.connect(self.db_path)
+            self.connection = tune_connection(sqlite3.connect(self.db_path))
             self.logger.info(f"Successfully connected to database: {self.db_path}")
             return True
         
@@ -55,8 +191,8 @@ class SteamGamesDBCreator:
             return False
     
     def disconnect(self):
-        """Close the database connection."""
-        if self.connection:
+        """Close the database connection, unless it is a shared one."""
+        if self.connection and self.connection is not self._shared_connection:
             self.connection.close()
             self.logger.info("Database connection closed")
     
@@ -72,97 +208,68 @@ class SteamGamesDBCreator:
             return False
         
         try:
-            cursor = self.connection.cursor()
-            
-            # Create games table (main table)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS games (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT UNIQUE NOT NULL,
-                    game_type TEXT,
-                    name TEXT NOT NULL,
-                    desc_snippet TEXT,
-                    recent_reviews TEXT,
-                    all_reviews TEXT,
-                    release_date TEXT,
-                    developer TEXT,
-                    publisher TEXT,
-                    popular_tags TEXT,
-                    game_details TEXT,
-                    languages TEXT,
-                    achievements INTEGER,
-                    genre TEXT,
-                    game_description TEXT,
-                    mature_content TEXT,
-                    minimum_requirements TEXT,
-                    recommended_requirements TEXT,
-                    original_price REAL,
-                    discount_price REAL,
-                    final_price REAL,
-                    discount_percentage REAL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            # Submit all tables as a single script and transaction; indexes are
+            # created separately by create_indexes() once data has been loaded
+            self.connection.executescript(_SQL_CREATE_TABLES)
             
-            # Create developers table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS developers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    games_count INTEGER DEFAULT 0,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create publishers table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS publishers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    games_count INTEGER DEFAULT 0,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            self.logger.info("All tables created successfully")
+            return True
             
-            # Create genres table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS genres (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    games_count INTEGER DEFAULT 0,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            self.logger.error(f"Error creating tables: {e}")
+            return False
+    
+    def create_indexes(self) -> bool:
+        """
+        Create the query indexes on the games and etl_logs tables.
+        
+        Intended to run after Loader.to_database, since one sorted index build
+        is much cheaper than maintaining every index on each insert.
+        
+        Returns:
+            bool: True if indexes created successfully, False otherwise
+        """
+        if not self.connection:
+            self.logger.error("No database connection available")
+            return False
+        
+        try:
+            self.connection.executescript(_SQL_CREATE_INDEXES)
             
-            # Create ETL logs table for tracking processing
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS etl_logs (
-                    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    process_name TEXT NOT NULL,
-                    start_time DATETIME NOT NULL,
-                    end_time DATETIME,
-                    status TEXT CHECK(status IN ('STARTED', 'COMPLETED', 'FAILED')) NOT NULL,
-                    records_processed INTEGER DEFAULT 0,
-                    error_message TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            self.logger.info("All indexes created successfully")
+            return True
             
-            # Create indexes for better query performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_name ON games(name)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_developer ON games(developer)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_publisher ON games(publisher)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_genre ON games(genre)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_release_date ON games(release_date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_price ON games(original_price)')
+        except sqlite3.Error as e:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            self.logger.error(f"Error creating indexes: {e}")
+            return False
+    
+    def populate_lookup_tables(self) -> bool:
+        """
+        Fill developers, publishers and genres with their games_count from the games table.
+        
+        Existing rows keep their id and only have games_count refreshed.
+        
+        Returns:
+            bool: True if lookup tables populated successfully, False otherwise
+        """
+        if not self.connection:
+            self.logger.error("No database connection available")
+            return False
+        
+        try:
+            self.connection.executescript(_SQL_POPULATE_LOOKUP_TABLES)
             
-            self.connection.commit()
-            self.logger.info("All tables created successfully")
+            self.logger.info("Lookup tables populated successfully")
             return True
             
         except sqlite3.Error as e:
-            self.logger.error(f"Error creating tables: {e}")
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            self.logger.error(f"Error populating lookup tables: {e}")
             return False
     
     def drop_all_tables(self) -> bool:
@@ -189,6 +296,8 @@ class SteamGamesDBCreator:
                 if table_name != 'sqlite_sequence':  # Skip SQLite system table
                     cursor.execute(f'DROP TABLE IF EXISTS {table_name}')
             
+            # Mark the schema as missing so initialize_database recreates it
+            cursor.execute('PRAGMA user_version = 0')
             self.connection.commit()
             self.logger.info("All tables dropped successfully")
             return True
@@ -201,6 +310,10 @@ class SteamGamesDBCreator:
         """
         Complete database initialization process.
         
+        Indexes are not created here; call create_indexes() after the ETL load.
+        The DDL is skipped when PRAGMA user_version already matches _SCHEMA_VERSION
+        and every Steam table and trigger exists.
+        
         Returns:
             bool: True if initialization successful, False otherwise
         """
@@ -209,6 +322,25 @@ class SteamGamesDBCreator:
         if not self.connect():
             return False
         
+        try:
+            schema_version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            objects = _STEAM_TABLES + _STEAM_TRIGGERS
+            placeholders = ', '.join('?' * len(objects))
+            existing = self.connection.execute(
+                f"SELECT COUNT(*) FROM sqlite_master "
+                f"WHERE type IN ('table', 'trigger') AND name IN ({placeholders})",
+                objects
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading schema version: {e}")
+            self.disconnect()
+            return False
+        
+        if schema_version == _SCHEMA_VERSION and existing == len(objects):
+            self.disconnect()
+            self.logger.info(f"Steam Games database schema is current (version {schema_version})")
+            return True
+        
         if not self.create_tables():
             self.disconnect()
             return False
@@ -218,18 +350,20 @@ class SteamGamesDBCreator:
         return True
 
 
-def create_steam_games_database(db_path: str, reset: bool = False) -> bool:
+def create_steam_games_database(db_path: str, reset: bool = False,
+                                connection: Optional[sqlite3.Connection] = None) -> bool:
     """
     Convenience function to create and initialize the Steam games database.
     
     Args:
         db_path (str): Path to the database file
         reset (bool): Whether to drop existing tables first
+        connection (sqlite3.Connection, optional): Shared connection to reuse
         
     Returns:
         bool: True if successful, False otherwise
     """
-    db_creator = SteamGamesDBCreator(db_path)
+    db_creator = SteamGamesDBCreator(db_path, connection)
     
     if reset:
         if db_creator.connect():
@@ -239,7 +373,56 @@ def create_steam_games_database(db_path: str, reset: bool = False) -> bool:
     return db_creator.initialize_database()
 
 
+def create_steam_games_indexes(db_path: str, connection: Optional[sqlite3.Connection] = None) -> bool:
+    """
+    Convenience function to build the Steam games indexes after the data load.
+    
+    Args:
+        db_path (str): Path to the database file
+        connection (sqlite3.Connection, optional): Shared connection to reuse
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    db_creator = SteamGamesDBCreator(db_path, connection)
+    
+    if not db_creator.connect():
+        return False
+    
+    try:
+        return db_creator.create_indexes()
+    finally:
+        db_creator.disconnect()
+
+
+def populate_steam_lookup_tables(db_path: str, connection: Optional[sqlite3.Connection] = None) -> bool:
+    """
+    Convenience function to refresh the developers, publishers and genres aggregates.
+    
+    Args:
+        db_path (str): Path to the database file
+        connection (sqlite3.Connection, optional): Shared connection to reuse
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    db_creator = SteamGamesDBCreator(db_path, connection)
+    
+    if not db_creator.connect():
+        return False
+    
+    try:
+        return db_creator.populate_lookup_tables()
+    finally:
+        db_creator.disconnect()
+
+
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # Example usage
     db_path = os.path.join(os.path.dirname(__file__), "steam_games.db")
     
@@ -1,3 +1,14 @@
+# Columnas de texto y precio del CSV de Steam; se leen como cadenas Arrow para que PyArrow
+# no infiera fechas o enteros que luego rechacen los valores por defecto de Transformer.clean.
+# 'achievements' queda fuera para conservar su tipo numérico
+_STRING_COLS = [
+    'url', 'types', 'name', 'desc_snippet', 'recent_reviews', 'all_reviews', 'release_date',
+    'developer', 'publisher', 'popular_tags', 'game_details', 'languages', 'genre',
+    'game_description', 'mature_content', 'minimum_requirements', 'recommended_requirements',
+    'original_price', 'discount_price',
+]
+
+
 class Extractor:
     """
     Clase para extraer datos de archivos fuente.
@@ -11,7 +22,14 @@ class Extractor:
         """
         import pandas as pd
         try:
-            df = pd.read_csv(self.file_path)
+            try:
+                # PyArrow parsea en C++ y guarda los textos en buffers Arrow contiguos
+                df = pd.read_csv(self.file_path, engine='pyarrow', dtype_backend='pyarrow',
+                                 dtype={col: 'string[pyarrow]' for col in _STRING_COLS})
+            except (ImportError, TypeError, ValueError):
+                # pyarrow es opcional (y dtype_backend requiere pandas>=2.0); si falta, o si
+                # rechaza el archivo (p. ej. saltos de línea entre comillas), se usa el parser de pandas
+                df = pd.read_csv(self.file_path)
             return df
         except Exception as e:
             print(f"Error al extraer datos: {e}")
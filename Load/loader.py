@@ -1,10 +1,82 @@
 
 import pandas as pd
 import sqlite3
+import itertools
 import logging
+from functools import lru_cache
 from typing import Optional, Union
 from datetime import datetime
 from Config.config import Config
+from Database.connection import tune_connection
+
+
+# Columns of the games table, in the order produced by Loader._prepare_records
+_GAMES_COLUMNS = (
+    'url', 'game_type', 'name', 'desc_snippet', 'recent_reviews', 'all_reviews',
+    'release_date', 'developer', 'publisher', 'popular_tags', 'game_details',
+    'languages', 'achievements', 'genre', 'game_description', 'mature_content',
+    'minimum_requirements', 'recommended_requirements', 'original_price',
+    'discount_price', 'final_price', 'discount_percentage'
+)
+
+# Stay under SQLite's default limit of 999 bound parameters per statement
+_ROWS_PER_INSERT = 999 // len(_GAMES_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(rows: int) -> str:
+    """Build the multi-row INSERT OR IGNORE statement for the given number of rows."""
+    placeholders = '(' + ', '.join('?' * len(_GAMES_COLUMNS)) + ')'
+    return (
+        f"INSERT OR IGNORE INTO games ({', '.join(_GAMES_COLUMNS)}) "
+        f"VALUES {', '.join([placeholders] * rows)}"
+    )
+
+
+# Statement used for every full group of rows; prepared once per connection
+_INSERT_SQL = _insert_sql(_ROWS_PER_INSERT)
+
+# Same cleaning as Transformer.clean + _prepare_records, expressed over the CSV virtual
+# table; the CSV extension yields '' for missing fields, hence the NULLIF calls
+_SQL_INSERT_FROM_CSV = '''
+    INSERT OR IGNORE INTO games (
+        url, game_type, name, desc_snippet, recent_reviews, all_reviews,
+        release_date, developer, publisher, popular_tags, game_details,
+        languages, achievements, genre, game_description, mature_content,
+        minimum_requirements, recommended_requirements, original_price,
+        discount_price, final_price, discount_percentage
+    )
+    SELECT
+        url,
+        COALESCE(NULLIF(types, ''), 'app'),
+        TRIM(name),
+        COALESCE(NULLIF(TRIM(desc_snippet), ''), 'Unknown'),
+        COALESCE(NULLIF(recent_reviews, ''), 'No reviews'),
+        COALESCE(NULLIF(all_reviews, ''), 'No reviews'),
+        COALESCE(NULLIF(release_date, ''), 'Unknown'),
+        COALESCE(NULLIF(TRIM(developer), ''), 'Unknown'),
+        COALESCE(NULLIF(TRIM(publisher), ''), 'Unknown'),
+        COALESCE(NULLIF(TRIM(popular_tags), ''), 'Unknown'),
+        COALESCE(NULLIF(game_details, ''), 'No details'),
+        COALESCE(NULLIF(languages, ''), 'English'),
+        CAST(achievements AS INTEGER),
+        COALESCE(NULLIF(TRIM(genre), ''), 'Unknown'),
+        COALESCE(NULLIF(game_description, ''), 'No description available'),
+        COALESCE(NULLIF(mature_content, ''), 'Not specified'),
+        COALESCE(NULLIF(minimum_requirements, ''), 'Not specified'),
+        COALESCE(NULLIF(recommended_requirements, ''), 'Not specified'),
+        original,
+        CASE WHEN discount > 0 THEN discount END,
+        CASE WHEN discount > 0 THEN discount ELSE original END,
+        CASE WHEN discount > 0 AND original > 0 THEN (original - discount) / original * 100 ELSE 0.0 END
+    FROM (
+        SELECT *,
+            CAST(TRIM(REPLACE(REPLACE(original_price, '$', ''), ',', '')) AS REAL) AS original,
+            CAST(TRIM(REPLACE(REPLACE(discount_price, '$', ''), ',', '')) AS REAL) AS discount
+        FROM temp.raw_games
+        WHERE NULLIF(url, '') IS NOT NULL AND NULLIF(name, '') IS NOT NULL
+    )
+'''
 
 
 class Loader:
@@ -12,16 +84,48 @@ class Loader:
     Clase para cargar los datos limpios a diferentes destinos (CSV, SQLite).
     """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, connection: Optional[sqlite3.Connection] = None):
         """
         Initialize the Loader with a DataFrame.
         
         Args:
             df (pd.DataFrame): The DataFrame to be loaded
+            connection (sqlite3.Connection, optional): Shared connection used by the
+                SQLite methods instead of opening one per call; it is never closed here
         """
         self.df = df
+        self.connection = connection
         self.logger = logging.getLogger(__name__)
     
+    def _connect(self, db_path: str) -> sqlite3.Connection:
+        """Return the shared connection, or open a tuned one for db_path."""
+        if self.connection is not None:
+            return self.connection
+        return tune_connection(sqlite3.connect(db_path))
+    
+    def _release(self, connection: sqlite3.Connection):
+        """Close a connection opened by _connect, leaving the shared one open."""
+        if connection is not self.connection:
+            connection.close()
+    
+    def _log_failure(self, connection: sqlite3.Connection, process_start: datetime, error: Exception):
+        """
+        Roll back a failed load and record it in etl_logs in its own transaction.
+        
+        The STARTED log row is written inside the load transaction, so it is
+        discarded by the rollback and a FAILED row is inserted in its place.
+        """
+        if connection.in_transaction:
+            connection.rollback()
+        try:
+            connection.execute('''
+                INSERT INTO etl_logs (process_name, start_time, end_time, status, records_processed, error_message)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', ('DATA_LOAD', process_start.isoformat(), datetime.now().isoformat(), 'FAILED', 0, str(error)))
+            connection.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not record failed load in etl_logs: {e}")
+    
     def to_csv(self, output_path: str) -> bool:
         """
         Guarda el DataFrame limpio en un archivo CSV.
@@ -53,13 +157,13 @@ class Loader:
         Returns:
             bool: True if successful, False otherwise
         """
-        db_path = db_path or Config.SQLITE_DB_PATH
+        db_path = db_path or Config.SQLITE_DB_PATH_STR
         table_name = table_name or Config.SQLITE_TABLE
         
         try:
-            conn = sqlite3.connect(db_path)
+            conn = self._connect(db_path)
             self.df.to_sql(table_name, conn, if_exists='replace', index=False)
-            conn.close()
+            self._release(conn)
             self.logger.info(f"Data saved to SQLite: {db_path}, table: {table_name}")
             print(f"Datos guardados en la base de datos SQLite: {db_path}, tabla: {table_name}")
             return True
@@ -75,57 +179,41 @@ class Loader:
         Args:
             db_path (str): Path to the SQLite database
             table_name (str): Target table name (default: 'games')
-            batch_size (int): Number of records to process at once
+            batch_size (int): Unused, kept for backward compatibility; all records
+                are sent to SQLite in a single executemany call
             
         Returns:
             bool: True if successful, False otherwise
         """
+        connection = None
+        process_start = datetime.now()
         try:
-            connection = sqlite3.connect(db_path)
+            connection = self._connect(db_path)
             cursor = connection.cursor()
             
+            # Run the whole load in one write transaction so WAL amortizes a single fsync
+            cursor.execute("BEGIN IMMEDIATE")
+            
             # Log the ETL process start
-            process_start = datetime.now()
             cursor.execute('''
                 INSERT INTO etl_logs (process_name, start_time, status, records_processed)
                 VALUES (?, ?, ?, ?)
             ''', ('DATA_LOAD', process_start.isoformat(), 'STARTED', 0))
             log_id = cursor.lastrowid
             
-            # Prepare the data for insertion
-            records_processed = 0
-            total_records = len(self.df)
+            # Prepare all records up front with vectorized column operations
+            records = list(self._prepare_records().itertuples(index=False, name=None))
+            records_processed = len(records)
             
-            # Process data in batches
-            for start_idx in range(0, total_records, batch_size):
-                end_idx = min(start_idx + batch_size, total_records)
-                batch_df = self.df.iloc[start_idx:end_idx]
-                
-                # Insert batch data
-                batch_records = []
-                for _, row in batch_df.iterrows():
-                    # Map DataFrame columns to database columns
-                    record = self._map_row_to_database_schema(row)
-                    if record:
-                        batch_records.append(record)
-                
-                if batch_records:
-                    # Use INSERT OR IGNORE to handle duplicates
-                    cursor.executemany('''
-                        INSERT OR IGNORE INTO games (
-                            url, game_type, name, desc_snippet, recent_reviews, all_reviews,
-                            release_date, developer, publisher, popular_tags, game_details,
-                            languages, achievements, genre, game_description, mature_content,
-                            minimum_requirements, recommended_requirements, original_price,
-                            discount_price, final_price, discount_percentage
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', batch_records)
-                    
-                    records_processed += len(batch_records)
-                    
-                    # Log progress
-                    if records_processed % (batch_size * 5) == 0:
-                        self.logger.info(f"Processed {records_processed}/{total_records} records")
+            # One executemany over every full multi-row statement, plus one for the remainder
+            full = records_processed - records_processed % _ROWS_PER_INSERT
+            cursor.executemany(_INSERT_SQL, (
+                tuple(itertools.chain.from_iterable(records[i:i + _ROWS_PER_INSERT]))
+                for i in range(0, full, _ROWS_PER_INSERT)
+            ))
+            if full < records_processed:
+                remainder = records[full:]
+                cursor.execute(_insert_sql(len(remainder)), tuple(itertools.chain.from_iterable(remainder)))
             
             # Update ETL log with completion status
             process_end = datetime.now()
@@ -136,7 +224,7 @@ class Loader:
             ''', (process_end.isoformat(), 'COMPLETED', records_processed, log_id))
             
             connection.commit()
-            connection.close()
+            self._release(connection)
             
             self.logger.info(f"Successfully loaded {records_processed} records to table: {table_name}")
             print(f"Successfully loaded {records_processed} records to database table: {table_name}")
@@ -145,117 +233,140 @@ class Loader:
         except Exception as e:
             self.logger.error(f"Error loading data to database: {e}")
             
-            # Log the error
-            try:
-                cursor.execute('''
-                    UPDATE etl_logs 
-                    SET end_time = ?, status = ?, error_message = ?
-                    WHERE log_id = ?
-                ''', (datetime.now().isoformat(), 'FAILED', str(e), log_id))
-                connection.commit()
-            except:
-                pass
-            
-            if 'connection' in locals():
-                connection.close()
+            # Discard the partial load, then log the error
+            if connection is not None:
+                self._log_failure(connection, process_start, e)
+                self._release(connection)
             
             print(f"Error loading data to database: {e}")
             return False
     
-    def _map_row_to_database_schema(self, row) -> Optional[tuple]:
+    def load_via_csv_vtable(self, db_path: str, csv_path: str, extension: str = 'csv') -> bool:
         """
-        Maps a DataFrame row to the database schema for Steam Games.
-        Maps the Steam Games CSV columns to the database schema.
+        Loads the raw CSV straight into the games table with one INSERT ... SELECT.
+        
+        The file is exposed through SQLite's CSV virtual table extension and cleaned
+        in SQL, so no DataFrame is built. If the extension cannot be loaded, falls
+        back to to_database() with the DataFrame given to this Loader. Only empty
+        fields count as missing; spellings such as 'nan' or 'NULL', which pandas
+        would parse as NaN, are loaded as text.
         
         Args:
-            row: Pandas Series representing a row of data
+            db_path (str): Path to the SQLite database
+            csv_path (str): Path to the raw Steam games CSV file
+            extension (str): Name or path of the SQLite CSV loadable extension
             
         Returns:
-            Optional[tuple]: Tuple of values for database insertion, or None if invalid
+            bool: True if successful, False otherwise
         """
+        connection = self._connect(db_path)
         try:
-            # Map Steam Games CSV columns to database schema
-            url = str(getattr(row, 'url', ''))
-            game_type = str(getattr(row, 'types', ''))
-            name = str(getattr(row, 'name', ''))
-            desc_snippet = str(getattr(row, 'desc_snippet', ''))
-            recent_reviews = str(getattr(row, 'recent_reviews', ''))
-            all_reviews = str(getattr(row, 'all_reviews', ''))
-            release_date = str(getattr(row, 'release_date', ''))
-            developer = str(getattr(row, 'developer', ''))
-            publisher = str(getattr(row, 'publisher', ''))
-            popular_tags = str(getattr(row, 'popular_tags', ''))
-            game_details = str(getattr(row, 'game_details', ''))
-            languages = str(getattr(row, 'languages', ''))
-            
-            # Handle achievements - convert to integer
-            achievements_val = getattr(row, 'achievements', 0)
-            achievements = int(achievements_val) if pd.notna(achievements_val) else 0
-            
-            genre = str(getattr(row, 'genre', ''))
-            game_description = str(getattr(row, 'game_description', ''))
-            mature_content = str(getattr(row, 'mature_content', ''))
-            minimum_requirements = str(getattr(row, 'minimum_requirements', ''))
-            recommended_requirements = str(getattr(row, 'recommended_requirements', ''))
-            
-            # Handle prices - clean and convert
-            def clean_price(price_str):
-                if pd.isna(price_str) or price_str == 'nan' or price_str == '':
-                    return 0.0
-                try:
-                    # Remove currency symbols and convert to float
-                    price_clean = str(price_str).replace('$', '').replace(',', '').strip()
-                    return float(price_clean) if price_clean else 0.0
-                except:
-                    return 0.0
+            connection.enable_load_extension(True)
+            try:
+                connection.load_extension(extension)
+            finally:
+                # Keep SQL-level load_extension() disabled on the shared connection
+                connection.enable_load_extension(False)
+        except (AttributeError, sqlite3.Error) as e:
+            # AttributeError: Python's sqlite3 was built without extension loading
+            self.logger.warning(f"SQLite CSV extension unavailable ({e}), falling back to to_database")
+            self._release(connection)
+            return self.to_database(db_path)
+        
+        process_start = datetime.now()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             
-            original_price = clean_price(getattr(row, 'original_price', 0))
-            discount_price = clean_price(getattr(row, 'discount_price', 0))
+            cursor.execute('''
+                INSERT INTO etl_logs (process_name, start_time, status, records_processed)
+                VALUES (?, ?, ?, ?)
+            ''', ('DATA_LOAD', process_start.isoformat(), 'STARTED', 0))
+            log_id = cursor.lastrowid
             
-            # Calculate final price and discount percentage
-            if discount_price > 0:
-                final_price = discount_price
-                discount_percentage = ((original_price - discount_price) / original_price * 100) if original_price > 0 else 0
-            else:
-                final_price = original_price
-                discount_percentage = 0.0
+            # Virtual table arguments cannot be bound, so quote the path as a literal
+            filename = csv_path.replace("'", "''")
+            cursor.execute(f"CREATE VIRTUAL TABLE temp.raw_games USING csv(filename='{filename}', header=YES)")
+            cursor.execute(_SQL_INSERT_FROM_CSV)
+            records_processed = cursor.rowcount
+            cursor.execute("DROP TABLE temp.raw_games")
             
-            # Validate required fields
-            if not url or url == 'nan' or not name or name == 'nan':
-                return None
+            cursor.execute('''
+                UPDATE etl_logs 
+                SET end_time = ?, status = ?, records_processed = ?
+                WHERE log_id = ?
+            ''', (datetime.now().isoformat(), 'COMPLETED', records_processed, log_id))
             
-            # Clean 'nan' strings to None for database
-            def clean_nan(val):
-                return None if val == 'nan' or val == '' else val
-                
-            return (
-                clean_nan(url),                    # url
-                clean_nan(game_type),             # game_type
-                clean_nan(name),                  # name
-                clean_nan(desc_snippet),          # desc_snippet
-                clean_nan(recent_reviews),        # recent_reviews
-                clean_nan(all_reviews),           # all_reviews
-                clean_nan(release_date),          # release_date
-                clean_nan(developer),             # developer
-                clean_nan(publisher),             # publisher
-                clean_nan(popular_tags),          # popular_tags
-                clean_nan(game_details),          # game_details
-                clean_nan(languages),             # languages
-                achievements,                      # achievements
-                clean_nan(genre),                 # genre
-                clean_nan(game_description),      # game_description
-                clean_nan(mature_content),        # mature_content
-                clean_nan(minimum_requirements),  # minimum_requirements
-                clean_nan(recommended_requirements), # recommended_requirements
-                original_price,                   # original_price
-                discount_price if discount_price > 0 else None, # discount_price
-                final_price,                      # final_price
-                discount_percentage               # discount_percentage
-            )
+            connection.commit()
+            self.logger.info(f"Successfully loaded {records_processed} records from CSV: {csv_path}")
+            return True
             
-        except Exception as e:
-            self.logger.warning(f"Error mapping row to schema: {e} - Row data: {getattr(row, 'name', 'Unknown')}")
-            return None
+        except sqlite3.Error as e:
+            self.logger.error(f"Error loading CSV through virtual table: {e}")
+            self._log_failure(connection, process_start, e)
+            return False
+        
+        finally:
+            self._release(connection)
+    
+    def _prepare_records(self) -> pd.DataFrame:
+        """
+        Maps the Steam Games DataFrame to the database schema in one vectorized pass.
+        
+        Expects the output of Transformer.clean, which already parses prices and
+        derives final_price and discount_percentage. Text columns become None
+        when missing, empty or 'nan'. Rows without url or name are dropped.
+        
+        Returns:
+            pd.DataFrame: Frame with the games table columns, in insertion order
+        """
+        df = self.df
+        
+        def text(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series([None] * len(df), index=df.index, dtype=object)
+            values = df[col].astype(str).astype(object)
+            return values.where(df[col].notna() & ~values.isin(['nan', '']), None)
+        
+        def number(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series(0.0, index=df.index)
+            return pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(float)
+        
+        if 'achievements' in df.columns:
+            achievements = pd.to_numeric(df['achievements'], errors='coerce').fillna(0).astype('int64')
+        else:
+            achievements = pd.Series(0, index=df.index, dtype='int64')
+        
+        discount_price = number('discount_price')
+        
+        records = pd.DataFrame({
+            'url': text('url'),
+            'game_type': text('types'),
+            'name': text('name'),
+            'desc_snippet': text('desc_snippet'),
+            'recent_reviews': text('recent_reviews'),
+            'all_reviews': text('all_reviews'),
+            'release_date': text('release_date'),
+            'developer': text('developer'),
+            'publisher': text('publisher'),
+            'popular_tags': text('popular_tags'),
+            'game_details': text('game_details'),
+            'languages': text('languages'),
+            'achievements': achievements,
+            'genre': text('genre'),
+            'game_description': text('game_description'),
+            'mature_content': text('mature_content'),
+            'minimum_requirements': text('minimum_requirements'),
+            'recommended_requirements': text('recommended_requirements'),
+            'original_price': number('original_price'),
+            'discount_price': discount_price.astype(object).where(discount_price > 0, None),
+            'final_price': number('final_price'),
+            'discount_percentage': number('discount_percentage'),
+        }, index=df.index)
+        
+        # Validate required fields
+        return records[records['url'].notna() & records['name'].notna()]
     
     def get_load_statistics(self, db_path: str) -> dict:
         """
@@ -268,12 +379,20 @@ class Loader:
             dict: Dictionary containing load statistics
         """
         try:
-            connection = sqlite3.connect(db_path)
+            connection = self._connect(db_path)
             cursor = connection.cursor()
             
-            # Get record count
-            cursor.execute("SELECT COUNT(*) FROM rides")
-            record_count = cursor.fetchone()[0]
+            # Get record count from the trigger-maintained counter, falling back to a
+            # full count for databases created before the stats table existed
+            try:
+                cursor.execute("SELECT val FROM stats WHERE key = 'games_count'")
+                row = cursor.fetchone()
+            except sqlite3.OperationalError:
+                row = None
+            if row is None:
+                cursor.execute("SELECT COUNT(*) FROM games")
+                row = cursor.fetchone()
+            record_count = row[0]
             
             # Get latest ETL log
             cursor.execute('''
@@ -284,7 +403,7 @@ class Loader:
             ''')
             latest_log = cursor.fetchone()
             
-            connection.close()
+            self._release(connection)
             
             return {
                 'total_records': record_count,
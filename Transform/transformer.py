@@ -1,76 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Valores por defecto para los campos de texto faltantes
+_TEXT_COLS = ['name', 'desc_snippet', 'developer', 'publisher', 'genre', 'popular_tags']
+_FILL_DEFAULTS = {
+    **{col: 'Unknown' for col in _TEXT_COLS},
+    'release_date': 'Unknown',
+    'recent_reviews': 'No reviews',
+    'all_reviews': 'No reviews',
+    'minimum_requirements': 'Not specified',
+    'recommended_requirements': 'Not specified',
+    'game_details': 'No details',
+    'languages': 'English',
+    'mature_content': 'Not specified',
+    'game_description': 'No description available',
+    'types': 'app',
+}
+
+# Columnas de baja cardinalidad que se guardan como 'category' (códigos enteros)
+_CATEGORICAL_COLS = ['developer', 'publisher', 'genre', 'types', 'mature_content', 'languages']
+
+
 class Transformer:
     """
     Clase para transformar y limpiar los datos extraídos de Steam Games.
     """
-    def __init__(self, df):
+    def __init__(self, df, max_workers=None):
+        """
+        Args:
+            df (pd.DataFrame): Datos extraídos
+            max_workers (int, optional): Hilos para limpiar columnas en paralelo;
+                None deja que ThreadPoolExecutor lo decida según las CPUs
+        """
         self.df = df
+        self.max_workers = max_workers
 
     def clean(self):
         """
         Realiza limpieza y transformación de los datos de Steam Games.
         """
         import pandas as pd
-        df = self.df.copy()
         
-        # Eliminar filas sin nombre o URL (campos requeridos)
-        df = df.dropna(subset=['name', 'url'])
+        # Eliminar filas sin nombre o URL (campos requeridos) y URLs duplicadas con una
+        # sola máscara; las filas inválidas no cuentan al buscar duplicados. El
+        # filtrado devuelve un DataFrame nuevo, así que no hace falta copiar self.df
+        valid = self.df['url'].notna() & self.df['name'].notna()
+        mask = valid & ~self.df['url'].where(valid).duplicated(keep='first')
+        df = self.df.loc[mask].reset_index(drop=True)
+        
+        # Rellenar todos los campos de texto faltantes en una sola llamada
+        df.fillna({col: default for col, default in _FILL_DEFAULTS.items() if col in df.columns}, inplace=True)
+        
+        def strip_text(series):
+            return series.astype(str).str.strip()
         
-        # Limpiar URLs duplicadas
-        df = df.drop_duplicates(subset=['url'])
+        def parse_price(series):
+            # Remove currency symbols and convert to numeric
+            return (series.astype(str)
+                    .str.replace(r'[\$,]', '', regex=True)
+                    .str.strip()
+                    .pipe(pd.to_numeric, errors='coerce')
+                    .fillna(0.0))
         
-        # Limpiar y normalizar columnas de texto
-        text_cols = ['name', 'desc_snippet', 'developer', 'publisher', 'genre', 'popular_tags']
-        for col in text_cols:
-            if col in df.columns:
-                df[col] = df[col].fillna('Unknown')
-                df[col] = df[col].astype(str).str.strip()
+        # Normalizar columnas de texto y limpiar precios; cada columna es independiente,
+        # así que se procesan en hilos (los kernels de pandas/Arrow liberan el GIL)
+        tasks = ([(col, strip_text) for col in df.columns.intersection(_TEXT_COLS)] +
+                 [(col, parse_price) for col in df.columns.intersection(['original_price', 'discount_price'])])
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            cleaned = dict(executor.map(lambda task: (task[0], task[1](df[task[0]])), tasks))
+        df = df.assign(**cleaned)
         
-        # Limpiar columnas de precios
-        price_cols = ['original_price', 'discount_price']
-        for col in price_cols:
-            if col in df.columns:
-                # Remove currency symbols and convert to numeric
-                df[col] = df[col].astype(str).str.replace('$', '').str.replace(',', '')
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
+        # Calcular precio final y porcentaje de descuento
+        if 'original_price' in df.columns:
+            original = df['original_price']
+            discount = df['discount_price'] if 'discount_price' in df.columns else pd.Series(0.0, index=df.index)
+            discounted = discount > 0
+            df['final_price'] = discount.where(discounted, original)
+            df['discount_percentage'] = ((original - discount) / original * 100).where(
+                discounted & (original > 0), 0.0
+            )
         
         # Limpiar achievements (convertir a entero)
         if 'achievements' in df.columns:
             df['achievements'] = pd.to_numeric(df['achievements'], errors='coerce').fillna(0).astype(int)
         
-        # Limpiar fechas de lanzamiento
-        if 'release_date' in df.columns:
-            df['release_date'] = df['release_date'].fillna('Unknown')
-        
-        # Limpiar reviews
-        review_cols = ['recent_reviews', 'all_reviews']
-        for col in review_cols:
-            if col in df.columns:
-                df[col] = df[col].fillna('No reviews')
-        
-        # Limpiar requirements
-        req_cols = ['minimum_requirements', 'recommended_requirements']
-        for col in req_cols:
-            if col in df.columns:
-                df[col] = df[col].fillna('Not specified')
-        
-        # Limpiar game_details y languages
-        if 'game_details' in df.columns:
-            df['game_details'] = df['game_details'].fillna('No details')
-        
-        if 'languages' in df.columns:
-            df['languages'] = df['languages'].fillna('English')
-        
-        # Limpiar mature_content
-        if 'mature_content' in df.columns:
-            df['mature_content'] = df['mature_content'].fillna('Not specified')
-        
-        # Limpiar game_description
-        if 'game_description' in df.columns:
-            df['game_description'] = df['game_description'].fillna('No description available')
-        
-        # Limpiar types
-        if 'types' in df.columns:
-            df['types'] = df['types'].fillna('app')
+        # Representar columnas repetitivas como categorías para reducir memoria
+        for col in df.columns.intersection(_CATEGORICAL_COLS):
+            df[col] = df[col].astype('category')
         
         print(f"Datos limpiados: {len(df)} registros después de la transformación")
         
@@ -1,8 +1,10 @@
 from Extract.extractor import Extractor
 from Transform.transformer import Transformer
 from Load.loader import Loader
-from Database.steam_db_creator import create_steam_games_database
+from Database.steam_db_creator import (create_steam_games_database, create_steam_games_indexes,
+                                       populate_steam_lookup_tables)
 from Config.config import Config
+from Database.connection import shared_connection
 import logging
 import sys
 
@@ -24,51 +26,65 @@ def main():
     logger.info("Starting ETL process...")
     
     try:
-        # Paso 0: Inicializar la base de datos
-        logger.info("Initializing database...")
-        if not create_steam_games_database(Config.SQLITE_DB_PATH, reset=False):
-            logger.error("Failed to initialize database. Aborting ETL process.")
-            return False
-        logger.info("Database initialized successfully")
+        # One SQLite connection is shared by the create, load and index phases
+        with shared_connection(Config.SQLITE_DB_PATH_STR) as connection:
+            # Paso 0: Inicializar la base de datos
+            logger.info("Initializing database...")
+            if not create_steam_games_database(Config.SQLITE_DB_PATH_STR, reset=False, connection=connection):
+                logger.error("Failed to initialize database. Aborting ETL process.")
+                return False
+            logger.info("Database initialized successfully")
         
-        # Paso 1: Extraer los datos
-        logger.info("Starting data extraction...")
-        extractor = Extractor(Config.INPUT_PATH)
-        df = extractor.extract()
+            # Paso 1: Extraer los datos
+            logger.info("Starting data extraction...")
+            extractor = Extractor(Config.INPUT_PATH)
+            df = extractor.extract()
         
-        if df is None:
-            logger.error("Failed to extract data. Aborting ETL process.")
-            return False
-        logger.info(f"Extracted {len(df)} records successfully")
+            if df is None:
+                logger.error("Failed to extract data. Aborting ETL process.")
+                return False
+            logger.info(f"Extracted {len(df)} records successfully")
 
-        # Paso 2: Transformar los datos
-        logger.info("Starting data transformation...")
-        transformer = Transformer(df)
-        cleaned_df = transformer.clean()
+            # Paso 2: Transformar los datos
+            logger.info("Starting data transformation...")
+            transformer = Transformer(df, Config.TRANSFORM_WORKERS)
+            cleaned_df = transformer.clean()
         
-        if cleaned_df is None:
-            logger.error("Failed to transform data. Aborting ETL process.")
-            return False
-        logger.info(f"Transformed {len(cleaned_df)} records successfully")
+            if cleaned_df is None:
+                logger.error("Failed to transform data. Aborting ETL process.")
+                return False
+            logger.info(f"Transformed {len(cleaned_df)} records successfully")
 
-        # Paso 3: Cargar los datos
-        logger.info("Starting data loading...")
-        loader = Loader(cleaned_df)
+            # Paso 3: Cargar los datos
+            logger.info("Starting data loading...")
+            loader = Loader(cleaned_df, connection)
         
-        # Load to CSV (existing functionality)
-        if hasattr(Config, 'OUTPUT_CLEAN_PATH'):
-            loader.to_csv(Config.OUTPUT_CLEAN_PATH)
-            logger.info(f"Data saved to CSV: {Config.OUTPUT_CLEAN_PATH}")
+            # Load to CSV (existing functionality)
+            if hasattr(Config, 'OUTPUT_CLEAN_PATH'):
+                loader.to_csv(Config.OUTPUT_CLEAN_PATH)
+                logger.info(f"Data saved to CSV: {Config.OUTPUT_CLEAN_PATH}")
         
-        # Load to database (new functionality)
-        if loader.to_database(Config.SQLITE_DB_PATH, Config.GAMES_TABLE):
-            logger.info(f"Data loaded to database table: {Config.GAMES_TABLE}")
-        else:
-            logger.error("Failed to load data to database")
-            return False
+            # Load to database (new functionality)
+            if loader.to_database(Config.SQLITE_DB_PATH_STR, Config.GAMES_TABLE):
+                logger.info(f"Data loaded to database table: {Config.GAMES_TABLE}")
+            else:
+                logger.error("Failed to load data to database")
+                return False
         
-        logger.info("ETL process completed successfully!")
-        return True
+            # Build indexes once the bulk load is done
+            if not create_steam_games_indexes(Config.SQLITE_DB_PATH_STR, connection):
+                logger.error("Failed to create database indexes")
+                return False
+            logger.info("Database indexes created successfully")
+        
+            # Precompute developer/publisher/genre counts in SQL
+            if not populate_steam_lookup_tables(Config.SQLITE_DB_PATH_STR, connection):
+                logger.error("Failed to populate lookup tables")
+                return False
+            logger.info("Lookup tables populated successfully")
+        
+            logger.info("ETL process completed successfully!")
+            return True
         
     except Exception as e:
         logger.error(f"Unexpected error in ETL process: {str(e)}")